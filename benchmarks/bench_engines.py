@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the threaded and async search engines against a local mock server.
+
+The mock server plays both roles at once: it is the HTTP proxy every search is
+sent through and the Google results page that answers it. Searches go to a
+plain http:// search URL, so the proxy receives the absolute request URI and can
+answer it directly without tunnelling anywhere.
+
+Usage:
+    python3 benchmarks/bench_engines.py --dorks 1000 --latency 100
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from io import StringIO
+from queue import Queue
+
+import requests
+from rich.console import Console
+from rich.table import Table
+
+# Make fknDrk importable when the benchmark is run from any directory
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fknDrk  # noqa: E402
+from mock_google import start_serp_server  # noqa: E402
+
+console = Console()
+
+
+def run_engine(engine, dorks, proxies, user_agents, args):
+    # Each engine gets a fresh results queue
+    results_queue = Queue()
+    session = requests.Session()
+
+    start_time = time.perf_counter()
+    if engine == "threads":
+        fknDrk.search_dorks(
+            dorks,
+            proxies,
+            user_agents,
+            session,
+            args.numResults,
+            False,
+            args.threads,
+            None,
+            results_queue,
+        )
+    else:
+        fknDrk.search_dorks_async(
+            dorks,
+            proxies,
+            user_agents,
+            session,
+            args.numResults,
+            False,
+            args.threads,
+            None,
+            results_queue,
+            max_in_flight=args.max_in_flight,
+            timeout=args.timeout,
+        )
+    elapsed_time = time.perf_counter() - start_time
+
+    # Compare the merged results each engine sent for the main process; the
+    # dorks without results are sent too, for the progress of the main process
+    sent_results = {
+        dork: results
+        for dork, results in (results_queue.get() for _ in range(results_queue.qsize()))
+        if results
+    }
+    return elapsed_time, len(sent_results), sent_results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dorks", type=int, default=1000, help="Number of dorks")
+    parser.add_argument(
+        "--latency", type=float, default=100, help="Mock latency per request (ms)"
+    )
+    parser.add_argument("--threads", type=int, default=20, help="Threaded engine size")
+    parser.add_argument(
+        "--max-in-flight", type=int, default=500, help="Async engine in-flight limit"
+    )
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout")
+    parser.add_argument("-n", "--numResults", type=int, default=30)
+    args = parser.parse_args()
+
+    server = start_serp_server(args.latency / 1000)
+    port = server.server_address[1]
+
+    # Point fknDrk at the mock server and make every dork cost one request
+    fknDrk.GOOGLE_SEARCH_URL = f"http://127.0.0.1:{port}/search"
+    fknDrk.MAX_RETRIES = 0
+    fknDrk.DEFAULT_BACKOFF_FACTOR = 0
+    fknDrk.console = Console(file=StringIO())
+
+    dorks = [f"inurl:bench{i} intext:{random.random()}" for i in range(args.dorks)]
+    proxies = fknDrk.ProxyPool([f"127.0.0.1:{port}"])
+    user_agents = ["fkndrk-bench"]
+
+    # Both engines write results/ and all_dorks_results.json into the cwd
+    workdir = tempfile.mkdtemp(prefix="fkndrk-bench-")
+    os.chdir(workdir)
+    os.makedirs("results")
+
+    table = Table(title="Engine benchmark", show_header=True)
+    table.add_column("Engine", style="bold")
+    table.add_column("Dorks", style="bold")
+    table.add_column("Completed", style="bold")
+    table.add_column("Seconds", style="bold")
+    table.add_column("Dorks/sec", style="bold")
+
+    outputs = {}
+    for engine in ("threads", "async"):
+        elapsed_time, completed, sent_results = run_engine(
+            engine, dorks, proxies, user_agents, args
+        )
+        outputs[engine] = sent_results
+        table.add_row(
+            engine,
+            str(len(dorks)),
+            str(completed),
+            f"{elapsed_time:.2f}",
+            f"{len(dorks) / elapsed_time:.1f}",
+        )
+
+    console.print(table)
+    console.print(
+        f"Mock latency {args.latency:.0f}ms, threads={args.threads}, "
+        f"max-in-flight={args.max_in_flight}, output dir {workdir}"
+    )
+    if outputs["threads"] != outputs["async"]:
+        console.print("[bold red]Engines produced different results![/bold red]")
+        sys.exit(1)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
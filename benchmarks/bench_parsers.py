@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the results parsers on the saved SERP corpus.
+
+Every parser is run over every page in benchmarks/serp_corpus. The script
+reports pages/sec for each parser and fails if a parser extracts different
+URLs than the original BeautifulSoup parser on any page.
+
+Usage:
+    python3 benchmarks/bench_parsers.py --repeat 20
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+from rich.console import Console
+from rich.table import Table
+
+# Make fknDrk importable when the benchmark is run from any directory
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import fknDrk  # noqa: E402
+
+CORPUS_DIR = os.path.join(BENCH_DIR, "serp_corpus")
+
+console = Console()
+
+
+def load_corpus(corpus_dir):
+    # Read every saved page in the corpus
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(corpus_dir, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Times each page is parsed"
+    )
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="Directory of .html pages")
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus)
+    if not pages:
+        console.print(f"[bold red]No pages found in {args.corpus}[/bold red]")
+        sys.exit(1)
+
+    # Skip parsers whose optional dependency is missing
+    parsers = {
+        name: extract_links
+        for name, extract_links in fknDrk.SERP_PARSERS.items()
+        if name != "lxml" or fknDrk.lxml is not None
+    }
+
+    # The original BeautifulSoup parser is the reference for every other one
+    expected_links = {
+        name: fknDrk.extract_links_bs4(html) for name, html in pages.items()
+    }
+
+    table = Table(title="Results parser benchmark", show_header=True)
+    table.add_column("Parser", style="bold")
+    table.add_column("Pages/sec", style="bold")
+    table.add_column("MB/sec", style="bold")
+    table.add_column("Speedup", style="bold")
+    table.add_column("Matches bs4", style="bold")
+
+    total_bytes = sum(len(html.encode()) for html in pages.values())
+    mismatches = []
+    rates = {}
+
+    for parser_name, extract_links in parsers.items():
+        # Check that the parser extracts the same URLs on every page
+        for page_name, html in pages.items():
+            if extract_links(html) != expected_links[page_name]:
+                mismatches.append((parser_name, page_name))
+
+        start_time = time.perf_counter()
+        for _ in range(args.repeat):
+            for html in pages.values():
+                extract_links(html)
+        elapsed_time = time.perf_counter() - start_time
+        rates[parser_name] = len(pages) * args.repeat / elapsed_time
+
+    for parser_name, pages_per_second in rates.items():
+        matches = parser_name not in {name for name, _ in mismatches}
+        table.add_row(
+            parser_name,
+            f"{pages_per_second:.1f}",
+            f"{pages_per_second * total_bytes / len(pages) / 1e6:.1f}",
+            f"{pages_per_second / rates['bs4']:.1f}x",
+            "yes" if matches else "[bold red]no[/bold red]",
+        )
+
+    # Also time the full path used while searching, including the shortcut for
+    # pages without results
+    for parser_name in parsers:
+        fknDrk.select_serp_parser(parser_name)
+        start_time = time.perf_counter()
+        for _ in range(args.repeat):
+            for html in pages.values():
+                fknDrk.extract_result_links(html)
+        elapsed_time = time.perf_counter() - start_time
+        console.print(
+            f"extract_result_links with {parser_name}: "
+            f"{len(pages) * args.repeat / elapsed_time:.1f} pages/sec"
+        )
+
+    console.print(table)
+    console.print(
+        f"{len(pages)} pages, {total_bytes / 1e6:.2f} MB, {args.repeat} rounds"
+    )
+
+    # Google Translate links must come out as the page they translate,
+    # without Translate's parameters
+    wrapped_links = [
+        (page_name, url)
+        for page_name, html in pages.items()
+        for url in fknDrk.extract_search_results(html, len(html))
+        if "translate.google." in url or "prev=search" in url
+    ]
+    for page_name, url in wrapped_links:
+        console.print(
+            f"[bold red]Translate link left wrapped on {page_name}: {url}[/bold red]"
+        )
+
+    for parser_name, page_name in mismatches:
+        console.print(
+            f"[bold red]{parser_name} extracted different URLs on {page_name}[/bold red]"
+        )
+    if mismatches or wrapped_links:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
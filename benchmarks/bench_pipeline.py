@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+"""
+Benchmark the whole FKNDRK pipeline against a local mock Google and a pool of
+local mock proxies.
+
+The run starts a mock results server and --proxies mock proxies with the given
+latency, failure and block rates, plus --dead-proxies addresses with nothing
+listening. With --proxy-lifetime every mock proxy dies after that many
+requests, and --reserve-proxies more mock proxies are only listed by two local
+proxy sources (a text list and an HTML table), for the proxy refresher to find
+once the pool decays. It first times load_or_download_proxies on that proxy list, then
+runs fknDrk's main() from a temporary directory: proxy validation, searching,
+the results journal and the final results files. Any argument after "--" is
+passed on to fknDrk, for example the engine or the number of workers.
+
+It reports dorks/sec, fetch latency percentiles, retries per dork and the peak
+memory of the main process and of the largest search process, read from the
+metrics the run exports.
+
+Usage:
+    python3 benchmarks/bench_pipeline.py --dorks 2000 --proxies 20 --dead-proxies 20 \\
+        --latency 50 --failure-rate 0.05 --block-rate 0.02 -- -e async -w 2
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+from io import StringIO
+
+import requests
+from rich.console import Console
+from rich.table import Table
+
+# Make fknDrk importable when the benchmark is run from any directory
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fknDrk  # noqa: E402
+from mock_google import (  # noqa: E402
+    dead_proxy_addresses,
+    server_address,
+    start_proxy_list_server,
+    start_proxy_servers,
+    start_serp_server,
+)
+
+console = Console()
+
+
+def write_config(workdir, dorks, proxies, proxy_sources=()):
+    # Lay out the config and resources folders fknDrk reads from the working directory
+    config_dir = os.path.join(workdir, "config")
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, "dorks.txt"), "w") as f:
+        f.write("\n".join(dorks))
+    with open(os.path.join(config_dir, "proxies.txt"), "w") as f:
+        f.write("\n".join(proxies))
+    if proxy_sources:
+        with open(os.path.join(config_dir, "proxy_sources.txt"), "w") as f:
+            f.write("\n".join(f"{kind} {url}" for kind, url in proxy_sources))
+    shutil.copy(os.path.join(REPO_DIR, "config", "useragents.txt"), config_dir)
+    shutil.copytree(
+        os.path.join(REPO_DIR, "resources"), os.path.join(workdir, "resources")
+    )
+
+
+def time_proxy_check(user_agents):
+    # Time testing the whole proxy list without the proxy cache
+    start_time = time.perf_counter()
+    working_proxies = fknDrk.load_or_download_proxies(
+        user_agents, requests.Session(), cache_ttl=0
+    )
+    return time.perf_counter() - start_time, len(working_proxies)
+
+
+def format_ms(seconds):
+    return "-" if seconds is None else f"{seconds * 1000:.0f}"
+
+
+def main():
+    # Everything after "--" goes to fknDrk itself
+    argv = sys.argv[1:]
+    fkndrk_args = []
+    if "--" in argv:
+        fkndrk_args = argv[argv.index("--") + 1 :]
+        argv = argv[: argv.index("--")]
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dorks", type=int, default=1000, help="Number of dorks")
+    parser.add_argument("--proxies", type=int, default=20, help="Working mock proxies")
+    parser.add_argument(
+        "--dead-proxies", type=int, default=20, help="Proxies with nothing listening"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=50, help="Latency added by each proxy (ms)"
+    )
+    parser.add_argument(
+        "--serp-latency", type=float, default=10, help="Mock Google latency (ms)"
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.05,
+        help="Share of proxied requests that drop the connection",
+    )
+    parser.add_argument(
+        "--block-rate",
+        type=float,
+        default=0.02,
+        help="Share of proxied requests answered with a 429 block page",
+    )
+    parser.add_argument(
+        "--soft-block-rate",
+        type=float,
+        default=0.0,
+        help="Share of proxied requests answered with a CAPTCHA page as a 200",
+    )
+    parser.add_argument(
+        "--backoff", type=float, default=0.05, help="Retry backoff factor (s)"
+    )
+    parser.add_argument(
+        "--proxy-lifetime",
+        type=int,
+        default=0,
+        help="Requests each mock proxy answers before it dies, 0 to never die",
+    )
+    parser.add_argument(
+        "--reserve-proxies",
+        type=int,
+        default=0,
+        help="Working mock proxies only listed by the local proxy sources",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Mock proxy random seed")
+    args = parser.parse_args(argv)
+
+    serp_server = start_serp_server(args.serp_latency / 1000)
+    proxy_servers = start_proxy_servers(
+        args.proxies,
+        latency=args.latency / 1000,
+        failure_rate=args.failure_rate,
+        block_rate=args.block_rate,
+        seed=args.seed,
+        soft_block_rate=args.soft_block_rate,
+        lifetime=args.proxy_lifetime,
+    )
+    proxies = [server_address(server) for server in proxy_servers]
+    proxies += dead_proxy_addresses(args.dead_proxies)
+
+    # The reserve proxies are listed by both proxy sources, so the refresher
+    # has to merge them without duplicates
+    reserve_servers = start_proxy_servers(
+        args.reserve_proxies,
+        latency=args.latency / 1000,
+        failure_rate=args.failure_rate,
+        block_rate=args.block_rate,
+        seed=args.seed + 1,
+        soft_block_rate=args.soft_block_rate,
+        lifetime=args.proxy_lifetime,
+    )
+    reserve_proxies = [server_address(server) for server in reserve_servers]
+    source_servers = []
+    proxy_sources = []
+    if reserve_proxies:
+        for kind in ("text", "table"):
+            source_server = start_proxy_list_server(
+                reserve_proxies, table=kind == "table"
+            )
+            source_servers.append(source_server)
+            proxy_sources.append((kind, f"http://{server_address(source_server)}/"))
+
+    # Point fknDrk at the mock servers and keep its output out of the way
+    serp_url = f"http://{server_address(serp_server)}"
+    fknDrk.GOOGLE_SEARCH_URL = f"{serp_url}/search"
+    fknDrk.PROXY_TEST_URL = f"{serp_url}/"
+    fknDrk.DEFAULT_BACKOFF_FACTOR = args.backoff
+    fknDrk.clear_screen = lambda: None
+    fknDrk.console = Console(file=StringIO())
+
+    workdir = tempfile.mkdtemp(prefix="fkndrk-pipeline-")
+    dorks = [f"inurl:pipeline{i} intext:bench" for i in range(args.dorks)]
+    write_config(workdir, dorks, proxies, proxy_sources)
+    os.chdir(workdir)
+
+    proxy_check_seconds, working_proxies = time_proxy_check(fknDrk.get_user_agents())
+
+    # Searching starts once every working proxy passed, and the rate limits
+    # are off so the numbers show the pipeline rather than the limits
+    sys.argv = [
+        "fknDrk.py",
+        "--no-cache",
+        "--rate",
+        "0",
+        "--proxy-rate",
+        "0",
+        "--min-proxies",
+        str(args.proxies),
+    ] + fkndrk_args
+    start_time = time.perf_counter()
+    try:
+        fknDrk.main()
+    except SystemExit as e:
+        if e.code:
+            console.print(f"[bold red]fknDrk exited with code {e.code}[/bold red]")
+            sys.exit(1)
+    elapsed_time = time.perf_counter() - start_time
+
+    # Read the run-wide metrics the run exported
+    run_metrics = fknDrk.Metrics()
+    with open(fknDrk.METRICS_JSON_FILE, "r") as f:
+        run_metrics.merge(json.load(f))
+    dorks_total = run_metrics.total("dorks_total")
+    dorks_done = run_metrics.total("dorks_total", outcome="done")
+    requests_total = run_metrics.total("requests_total")
+    search_rounds = run_metrics.total("search_rounds_total")
+
+    # ru_maxrss is in kilobytes on Linux; for the children it is the largest
+    # search process
+    peak_main = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    peak_worker = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+    table = Table(title="Pipeline benchmark", show_header=True)
+    table.add_column("Metric", style="bold")
+    table.add_column("Value", style="bold")
+    table.add_row("Proxy check (s)", f"{proxy_check_seconds:.2f}")
+    table.add_row("Working proxies", f"{working_proxies} / {len(proxies)}")
+    table.add_row(
+        "Proxy refreshes / final pool",
+        f"{run_metrics.total('proxy_refreshes_total')} / "
+        f"{run_metrics.gauge('proxy_pool_size')}",
+    )
+    table.add_row("Run time (s)", f"{elapsed_time:.2f}")
+    table.add_row("Dorks done / total", f"{dorks_done} / {len(dorks)}")
+    table.add_row("Dorks/sec", f"{dorks_total / elapsed_time:.1f}")
+    table.add_row("Requests/sec", f"{requests_total / elapsed_time:.1f}")
+    for outcome in ("ok", "empty", "exception") + fknDrk.BLOCK_OUTCOMES:
+        table.add_row(
+            f"  {outcome}", str(run_metrics.total("requests_total", outcome=outcome))
+        )
+    table.add_row(
+        "Fetch p50 / p99 (ms)",
+        " / ".join(
+            format_ms(run_metrics.quantile("stage_seconds", q, stage="fetch"))
+            for q in (0.5, 0.99)
+        ),
+    )
+    table.add_row(
+        "Retries per dork",
+        f"{(search_rounds - dorks_total) / dorks_total if dorks_total else 0:.2f}",
+    )
+    table.add_row("Peak memory main (MB)", f"{peak_main:.1f}")
+    table.add_row("Peak memory worker (MB)", f"{peak_worker:.1f}")
+
+    console.print(table)
+    console.print(
+        f"{args.proxies} proxies (+{args.dead_proxies} dead), latency {args.latency:.0f}ms, "
+        f"failure rate {args.failure_rate}, block rate {args.block_rate}, "
+        f"soft block rate {args.soft_block_rate}, "
+        f"proxy lifetime {args.proxy_lifetime or '-'}, "
+        f"{args.reserve_proxies} reserve proxies, "
+        f"fknDrk args {' '.join(fkndrk_args) or '-'}, output dir {workdir}"
+    )
+
+    for server in [serp_server] + proxy_servers + reserve_servers + source_servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+
+"""
+Check the lease and submit rules of the SQLite and Redis work queues.
+
+Two nodes share each queue. The checks cover a lease running out and passing
+to the other node, renewals, results submitted twice for a dork, failed dorks
+and a whole queue searched through ClaimedDorks. The Redis queue runs its Lua
+scripts on fakeredis unless --redis points at a real server; the keys the check
+creates there are deleted afterwards.
+
+Usage:
+    python3 benchmarks/check_work_queue.py
+    python3 benchmarks/check_work_queue.py --redis redis://localhost:6379/15
+"""
+
+import os
+import sys
+import time
+import uuid
+import argparse
+import threading
+import tempfile
+import contextlib
+
+from rich.console import Console
+
+# Make fknDrk importable when the check is run from any directory
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import fknDrk  # noqa: E402
+
+console = Console()
+
+# Lease of the checks in seconds, short enough to let it run out
+LEASE = 1.0
+
+
+@contextlib.contextmanager
+def sqlite_queues():
+    # Two nodes on one SQLite database file
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "queue.db")
+        first = fknDrk.SQLiteWorkQueue(path, node_id="node-a")
+        second = fknDrk.SQLiteWorkQueue(path, node_id="node-b")
+        try:
+            yield first, second
+        finally:
+            first.close()
+            second.close()
+
+
+@contextlib.contextmanager
+def redis_queues(redis_url):
+    # Two nodes on one Redis server, under a prefix of their own
+    prefix = f"fkndrk-check-{uuid.uuid4().hex}"
+    if redis_url is None:
+        import fakeredis
+
+        # Every client the queues open talks to the same fake server
+        server = fakeredis.FakeServer()
+        from_url = fknDrk.redis.Redis.from_url
+        fknDrk.redis.Redis.from_url = lambda url, **kwargs: fakeredis.FakeRedis(
+            server=server, **kwargs
+        )
+    try:
+        first = fknDrk.RedisWorkQueue(redis_url, node_id="node-a", prefix=prefix)
+        second = fknDrk.RedisWorkQueue(redis_url, node_id="node-b", prefix=prefix)
+    finally:
+        if redis_url is None:
+            fknDrk.redis.Redis.from_url = from_url
+    try:
+        yield first, second
+    finally:
+        first.client.delete(*first.client.keys(f"{prefix}:*") or [prefix])
+        first.close()
+        second.close()
+
+
+def check_lease_expiry(first, second):
+    first.add(["dork 1", "dork 2"])
+    assert first.claim(10, LEASE) == ["dork 1", "dork 2"]
+    assert second.claim(10, LEASE) == [], "claimed dorks another node leased"
+
+    # A renewed lease outlives its first expiry
+    time.sleep(LEASE / 2)
+    first.renew(["dork 1"], 10 * LEASE)
+    time.sleep(LEASE)
+    assert second.claim(10, LEASE) == ["dork 2"], "expired lease was not taken over"
+
+    # The node that lost the lease can't renew it or mark it failed
+    first.renew(["dork 2"], 10 * LEASE)
+    assert not first.fail("dork 2"), "failed a dork leased to another node"
+    assert first.status()["leased"] == 2
+
+
+def check_duplicate_submit(first, second):
+    first.add(["dork 1"])
+    assert first.claim(10, LEASE) == ["dork 1"]
+    time.sleep(LEASE * 1.5)
+    assert second.claim(10, LEASE) == ["dork 1"]
+
+    # Only the first results submitted are kept, from either node
+    assert second.complete("dork 1", ["https://second.example/"])
+    assert not first.complete("dork 1", ["https://first.example/"])
+    assert not first.fail("dork 1") and not second.fail("dork 1")
+    assert first.results() == [("dork 1", ["https://second.example/"])]
+    assert first.status() == {"pending": 0, "leased": 0, "done": 1, "failed": 0}
+
+
+def check_late_submit(first, second):
+    # A node that submits after its lease ran out still counts, and the dork
+    # is not claimed again
+    first.add(["dork 1"])
+    assert first.claim(10, LEASE) == ["dork 1"]
+    time.sleep(LEASE * 1.5)
+    assert first.complete("dork 1", [])
+    assert second.claim(10, LEASE) == [], "claimed a completed dork"
+    assert not second.has_pending()
+
+
+def check_requeue_failed(first, second):
+    first.add(["dork 1"])
+    assert first.claim(10, LEASE) == ["dork 1"]
+    assert first.fail("dork 1")
+    assert not first.has_pending()
+    assert first.requeue_failed() == 1
+    assert second.claim(10, LEASE) == ["dork 1"]
+    assert second.complete("dork 1", [])
+    assert first.status()["failed"] == 0
+
+
+def check_claimed_dorks(first, second):
+    # Two nodes reading small batches at once search every dork exactly once
+    dorks = [f"dork {i}" for i in range(25)]
+    first.add(dorks)
+    searched = []
+
+    def search(work_queue):
+        with fknDrk.ClaimedDorks(work_queue, batch_size=4, lease=LEASE) as reader:
+            for dork in reader:
+                searched.append(dork)
+                assert reader.complete(dork, [dork])
+
+    threads = [threading.Thread(target=search, args=(q,)) for q in (first, second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(searched) == sorted(dorks), "dorks searched twice or missed"
+    assert first.status()["done"] == len(dorks)
+
+
+CHECKS = [
+    check_lease_expiry,
+    check_duplicate_submit,
+    check_late_submit,
+    check_requeue_failed,
+    check_claimed_dorks,
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--redis",
+        help="Redis URL to run the Redis checks against instead of fakeredis",
+    )
+    args = parser.parse_args()
+
+    # Poll the queue often, the other node only holds its dorks briefly
+    fknDrk.WORK_QUEUE_POLL_INTERVAL = 0.1
+
+    backends = {
+        "sqlite": sqlite_queues,
+        "redis": lambda: redis_queues(args.redis),
+    }
+    failures = 0
+    for backend, open_queues in backends.items():
+        for check in CHECKS:
+            try:
+                with open_queues() as (first, second):
+                    check(first, second)
+            except AssertionError as e:
+                failures += 1
+                console.print(
+                    f"[bold red]FAIL[/bold red] {backend} {check.__name__}: {e}"
+                )
+            else:
+                console.print(f"[bold green]ok[/bold green] {backend} {check.__name__}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
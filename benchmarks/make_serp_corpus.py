@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""
+Generate the SERP corpus used by bench_parsers.py.
+
+The pages follow the markup of Google results pages: large inline style and
+script blocks, result blocks wrapped in a ".yuRUbf" element, sitelinks,
+Google Translate links, HTML entities in links and result-like markup inside
+scripts that must not be extracted. Saved real pages can be dropped into
+serp_corpus/ next to them, the benchmark picks up every .html file.
+
+Usage:
+    python3 benchmarks/make_serp_corpus.py
+"""
+
+import os
+import random
+from html import escape
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "serp_corpus")
+
+DOMAINS = [
+    "example.com",
+    "docs.example.org",
+    "shop.example.net",
+    "forum.example.io",
+    "wiki.example.dev",
+    "files.example.co.uk",
+]
+PATHS = [
+    "index.php?id={n}",
+    "admin/login.asp",
+    "wp-content/uploads/{n}/backup.sql",
+    "search?q=test&amp;page={n}",
+    "files/report_{n}.pdf",
+    "view.php?file=..%2F{n}",
+    "cgi-bin/test.cgi?user=guest&amp;id={n}",
+    "résumé/{n}.html",
+]
+
+
+def random_identifier(rng, length=6):
+    return "".join(
+        rng.choice("abcdefghijklmnopqrstuvwxyzABCDEFGHIJ") for _ in range(length)
+    )
+
+
+def build_style(rng, rules):
+    # Minified CSS like the inline style blocks of a results page
+    return "".join(
+        f".{random_identifier(rng)}{{margin:{rng.randint(0, 20)}px;color:#{rng.randint(0, 0xFFFFFF):06x};display:block}}"
+        for _ in range(rules)
+    )
+
+
+def build_script(rng, statements):
+    # Minified JS, including strings that look like result markup
+    parts = []
+    for i in range(statements):
+        name = random_identifier(rng)
+        if i % 50 == 0:
+            parts.append(
+                f'var {name}=\'<div class="yuRUbf"><a href="https://script.invalid/{i}">x</a></div>\';'
+            )
+        else:
+            parts.append(
+                f"function {name}(a,b){{return a<b?a+{i}:b-{i}}};var {name}_{i}={rng.random()};"
+            )
+    return "".join(parts)
+
+
+def build_url(rng, n, translate=False):
+    url = f"https://{rng.choice(DOMAINS)}/{rng.choice(PATHS).format(n=n)}"
+    if translate:
+        # Translate's own parameters go before the page, and sometimes after it
+        suffix = "&amp;prev=search&amp;pto=aue" if n % 4 == 0 else ""
+        return f"https://translate.google.com/translate?hl=en&amp;sl=de&amp;u={url}{suffix}"
+    return url
+
+
+def build_result(rng, n, translate=False, sitelinks=0, extra_class=False):
+    url = build_url(rng, n, translate)
+    classes = "yuRUbf tF2Cxc" if extra_class else "yuRUbf"
+    sitelink_html = "".join(
+        f'<td><div class="usJj9c"><a href="{build_url(rng, n * 100 + i)}">Sitelink {i}</a></div></td>'
+        for i in range(sitelinks)
+    )
+    return (
+        f'<div class="g"><div class="tF2Cxc"><div class="{classes}">'
+        f'<a href="{url}" data-ved="{random_identifier(rng, 20)}" ping="/url?sa=t&amp;url={url}">'
+        f'<br><h3 class="LC20lb DKV0Md">Result {n} &ndash; {escape(random_identifier(rng, 12))}</h3>'
+        f'<div class="TbwUpd"><cite class="iUh30">{escape(url)}</cite></div></a>'
+        f'<div class="B6fmyf"><div class="eFM0qc"><span><div role="button" class="action-menu">'
+        f'<img src="data:image/png;base64,AAAA" alt=""><a class="fl" role="button">Options</a>'
+        f"</div></span></div></div></div>"
+        f'<div class="VwiC3b"><span>Snippet text for result {n}, <em>matched</em> terms'
+        f"<br/>and a second line.</span></div>"
+        f"{'<table><tr>' + sitelink_html + '</tr></table>' if sitelinks else ''}"
+        f"</div></div>"
+    )
+
+
+def build_page(rng, results, style_rules=600, script_statements=1200, extras=""):
+    return (
+        '<!doctype html><html lang="en"><head><meta charset="UTF-8">'
+        "<title>inurl:admin - Google Search</title>"
+        f"<style>{build_style(rng, style_rules)}</style>"
+        f'<script nonce="{random_identifier(rng, 22)}">{build_script(rng, script_statements)}</script>'
+        '</head><body><div id="main"><div id="cnt"><div id="rcnt">'
+        f'<div id="center_col"><div id="search"><div id="rso">{extras}{results}</div></div></div>'
+        "</div></div></div>"
+        f"<script>{build_script(rng, script_statements // 2)}</script>"
+        "</body></html>"
+    )
+
+
+def main():
+    rng = random.Random(1337)
+    os.makedirs(CORPUS_DIR, exist_ok=True)
+    pages = {}
+
+    # A plain first page with 10 results
+    pages["serp_basic.html"] = build_page(
+        rng, "".join(build_result(rng, n) for n in range(10))
+    )
+
+    # Google Translate wrapped links and entities in links
+    pages["serp_translate.html"] = build_page(
+        rng,
+        "".join(
+            build_result(rng, n, translate=n % 2 == 0, extra_class=n % 3 == 0)
+            for n in range(10)
+        ),
+    )
+
+    # A 100 results page (num=100)
+    pages["serp_num100.html"] = build_page(
+        rng,
+        "".join(build_result(rng, n, extra_class=n % 4 == 0) for n in range(100)),
+        style_rules=1000,
+        script_statements=2000,
+    )
+
+    # Ads, a featured snippet and sitelinks around the organic results
+    extras = (
+        '<div id="tads"><div class="uEierd"><a href="https://ads.example.com/?gclid=1">Ad</a></div></div>'
+        '<div class="xpdopen"><div class="ifM9O"><div class="yuRUbf">'
+        f'<a href="{build_url(rng, 999)}"><h3>Featured snippet</h3></a></div></div></div>'
+        '<div class="related-question-pair"><div class="wQiwMc"><a href="/search?q=related">Related</a></div></div>'
+    )
+    pages["serp_mixed.html"] = build_page(
+        rng,
+        "".join(build_result(rng, n, sitelinks=4 if n == 0 else 0) for n in range(9)),
+        extras=extras,
+    )
+
+    # A query that did not match anything
+    pages["serp_no_results.html"] = build_page(
+        rng,
+        '<div class="card-section"><p>Your search - <b>inurl:nothing</b> - did not match any documents.</p></div>',
+    )
+
+    # An "unusual traffic" block page
+    pages["serp_blocked.html"] = (
+        "<html><head><title>https://www.google.com/search?q=inurl%3Aadmin</title></head>"
+        '<body><div id="captcha-form"><form id="captcha-form" action="index" method="post">'
+        '<div class="g-recaptcha" data-sitekey="6LfwuyUTAAAAAOAmoS0fdqijC2PbbdH4kjq62Y1b"></div>'
+        "</form></div><div>Our systems have detected unusual traffic from your computer network."
+        "</div></body></html>"
+    )
+
+    for name, html in pages.items():
+        with open(os.path.join(CORPUS_DIR, name), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"{name}: {len(html) // 1024} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""
+Local mock Google results server and mock HTTP proxies for the benchmarks.
+
+The results server answers /search with pages in the same markup as Google's
+(every link inside a .yuRUbf element) and honours the q, num and start
+parameters. Any other path is answered with a small page, so the server can
+also stand in for the page proxies are tested against.
+
+The mock proxies forward plain http:// requests (sent with an absolute request
+URI) to the server they name, after a configurable latency. A share of the
+requests can fail, by dropping the connection without an answer, be
+blocked, with a 429 "unusual traffic" page like Google sends, or be soft
+blocked, with a CAPTCHA page sent as a 200. A proxy can also be given a
+lifetime, after which it drops every request, like a public proxy going down.
+
+The mock proxy list server stands in for a proxy source, serving a list of
+proxies as plain text or as an HTML table.
+"""
+
+import http.client
+import itertools
+import random
+import socket
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+BLOCK_HTML = (
+    "<html><body><div id='infoDiv'>Our systems have detected unusual traffic "
+    "from your computer network.</div></body></html>"
+)
+CAPTCHA_HTML = (
+    "<html><body><form id='captcha-form' action='/sorry/index' method='post'>"
+    "<div class='g-recaptcha'></div></form></body></html>"
+)
+
+
+def build_serp_html(query, num_links=10, start=0):
+    # Build a minimal results page with the same markup the extractor looks for,
+    # with links derived from the query so every engine sees the same page.
+    # Every query has between 10 and 259 results in total, so pagination
+    # stops on a short page at a different offset for each dork
+    query_id = zlib.crc32(query.encode())
+    total_links = 10 + query_id % 250
+    links = "".join(
+        f'<div class="yuRUbf"><a href="https://example.com/{query_id}/{i}">'
+        f"<h3>Result {i}</h3></a></div>"
+        for i in range(start, min(start + num_links, total_links))
+    )
+    return f"<html><body><div id='search'>{links}</div></body></html>"
+
+
+def send_html(handler, status, html, content_type="text/html"):
+    body = html.encode()
+    handler.send_response(status)
+    handler.send_header("Content-Type", content_type)
+    handler.send_header("Content-Length", str(len(body)))
+    try:
+        handler.end_headers()
+        handler.wfile.write(body)
+    except (BrokenPipeError, ConnectionResetError):
+        # The client stopped reading, e.g. once it recognized a block page
+        handler.close_connection = True
+
+
+def make_serp_handler(latency):
+    class MockSerpHandler(BaseHTTPRequestHandler):
+        # Keep connections alive so clients can reuse them
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            # Simulate the time Google takes to answer
+            time.sleep(latency)
+            # The path is absolute when the server is also used as the proxy
+            url = urlsplit(self.path)
+            if url.path != "/search":
+                send_html(self, 200, "<html><body>ok</body></html>")
+                return
+            params = parse_qs(url.query)
+            send_html(
+                self,
+                200,
+                build_serp_html(
+                    params.get("q", [""])[0],
+                    num_links=int(params.get("num", ["10"])[0]),
+                    start=int(params.get("start", ["0"])[0]),
+                ),
+            )
+
+        def log_message(self, format, *args):
+            # Silence the default per-request logging
+            pass
+
+    return MockSerpHandler
+
+
+def make_proxy_handler(
+    latency, failure_rate, block_rate, rng, soft_block_rate=0.0, lifetime=0
+):
+    # Number of requests this proxy answered, for its lifetime
+    answered = itertools.count(1)
+
+    class MockProxyHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            # Simulate the extra hop through the proxy
+            time.sleep(latency)
+
+            roll = rng.random()
+            if roll < failure_rate or (lifetime and next(answered) > lifetime):
+                # Drop the connection without an answer, like a flaky proxy
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            if roll < failure_rate + block_rate:
+                send_html(self, 429, BLOCK_HTML)
+                return
+            if roll < failure_rate + block_rate + soft_block_rate:
+                send_html(self, 200, CAPTCHA_HTML)
+                return
+
+            # Forward the request to the server named in the absolute URI
+            url = urlsplit(self.path)
+            upstream = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+            try:
+                upstream.request(
+                    "GET",
+                    f"{url.path}?{url.query}" if url.query else url.path or "/",
+                    headers={"User-Agent": self.headers.get("User-Agent", "")},
+                )
+                response = upstream.getresponse()
+                send_html(self, response.status, response.read().decode())
+            except OSError:
+                send_html(self, 502, "<html><body>Bad gateway</body></html>")
+            finally:
+                upstream.close()
+
+        def do_CONNECT(self):
+            # Only plain http:// requests are forwarded
+            send_html(self, 405, "<html><body>CONNECT not supported</body></html>")
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockProxyHandler
+
+
+def build_proxy_table_html(proxies):
+    # Build a proxy list page like free-proxy-list.net, with the IP address
+    # and port in the first two columns
+    rows = "".join(
+        f"<tr><td>{proxy.rsplit(':', 1)[0]}</td><td>{proxy.rsplit(':', 1)[1]}</td>"
+        "<td>US</td><td>elite proxy</td></tr>"
+        for proxy in proxies
+    )
+    return (
+        "<html><body><table><thead><tr><th>IP Address</th><th>Port</th>"
+        f"<th>Code</th><th>Anonymity</th></tr></thead><tbody>{rows}</tbody>"
+        "</table></body></html>"
+    )
+
+
+def make_proxy_list_handler(proxies, table=False):
+    class MockProxyListHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            # Serve the current list, so callers can change it between fetches
+            if table:
+                send_html(self, 200, build_proxy_table_html(proxies))
+            else:
+                send_html(self, 200, "\n".join(proxies), content_type="text/plain")
+
+        def log_message(self, format, *args):
+            pass
+
+    return MockProxyListHandler
+
+
+def start_server(handler):
+    # Serve a handler on a free local port from a background thread
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.request_queue_size = 4096
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def start_serp_server(latency=0.0):
+    # Start the mock results server
+    return start_server(make_serp_handler(latency))
+
+
+def start_proxy_list_server(proxies, table=False):
+    # Start a mock proxy source serving the given list of proxies
+    return start_server(make_proxy_list_handler(proxies, table=table))
+
+
+def start_proxy_servers(
+    count,
+    latency=0.0,
+    failure_rate=0.0,
+    block_rate=0.0,
+    seed=None,
+    soft_block_rate=0.0,
+    lifetime=0,
+):
+    # Start count mock proxies that share the same latency, failure and block
+    # rates and lifetime, each with its own random generator
+    rng = random.Random(seed)
+    return [
+        start_server(
+            make_proxy_handler(
+                latency,
+                failure_rate,
+                block_rate,
+                random.Random(rng.random()),
+                soft_block_rate=soft_block_rate,
+                lifetime=lifetime,
+            )
+        )
+        for _ in range(count)
+    ]
+
+
+def dead_proxy_addresses(count):
+    # Addresses of local ports with nothing listening, for proxies that fail
+    # every test
+    addresses = []
+    for _ in range(count):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            addresses.append(f"127.0.0.1:{sock.getsockname()[1]}")
+    return addresses
+
+
+def server_address(server):
+    host, port = server.server_address[:2]
+    return f"{host}:{port}"